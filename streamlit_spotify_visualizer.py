@@ -1,15 +1,30 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth, SpotifyClientCredentials
+from spotipy.cache_handler import CacheHandler
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import time
+import threading
 import json
 from datetime import datetime
 import base64
+import diskcache
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from itertools import chain
+
+# Serialize figures with orjson, which encodes NumPy arrays natively and much faster than json
+pio.json.config.default_engine = 'orjson'
 
 # Set page config
 st.set_page_config(
@@ -19,8 +34,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for styling
-st.markdown("""
+# Custom CSS for styling, built once at import rather than on every rerun
+_CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -47,7 +62,7 @@ st.markdown("""
         border-left: 4px solid #1DB954;
     }
     
-    .stButton > button {
+    .stButton > button, .stFormSubmitButton > button {
         background: linear-gradient(45deg, #1DB954, #1ed760);
         color: white;
         border: none;
@@ -62,7 +77,213 @@ st.markdown("""
         color: white;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Spotify paging limits and how many page requests may be in flight at once
+_PLAYLIST_TRACKS_PAGE_SIZE = 100
+_USER_PLAYLISTS_PAGE_SIZE = 50
+_AUDIO_FEATURES_BATCH_SIZE = 100
+_AUDIO_FEATURES_FALLBACK_BATCH_SIZE = 50
+_MAX_CONCURRENT_REQUESTS = 5
+_SPOTIFY_REQUESTS_PER_SECOND = 10
+
+# Columns of the playlist track table
+_TRACK_COLUMNS = ('name', 'artist', 'id', 'preview_url', 'popularity', 'duration_ms')
+# Ask Spotify for just those fields (plus the page total) instead of full track objects
+_PLAYLIST_TRACK_FIELDS = 'total,items(track(id,name,artists(name),preview_url,popularity,duration_ms))'
+
+def _script_context_executor(max_workers):
+    """ThreadPoolExecutor whose workers share the script's run context, so they can call st.cache_data functions"""
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    )
+
+def _fetch_all_pages(fetch_page, page_size):
+    """Fetch every item of a Spotify paging object, requesting pages after the first concurrently"""
+    first_page = fetch_page(limit=page_size, offset=0)
+    offsets = range(page_size, first_page['total'], page_size)
+    if not offsets:
+        return first_page['items']
+    
+    # The pool size bounds in-flight requests; the session's urllib3 Retry waits out 429s per Retry-After
+    with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_REQUESTS, len(offsets))) as executor:
+        pages = list(executor.map(lambda offset: fetch_page(limit=page_size, offset=offset), offsets))
+    
+    return list(chain(first_page['items'], *(page['items'] for page in pages)))
+
+class LeakyBucket:
+    """Thread-safe token bucket that smooths bursts of requests down to a steady rate"""
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+            else:
+                # Waiting earns exactly the token this request spends
+                time.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 0
+                self.last = time.monotonic()
+
+# Spotify rate-limits per app, so every session and worker thread in the process shares one bucket
+_spotify_rate_limiter = LeakyBucket(_SPOTIFY_REQUESTS_PER_SECOND)
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that waits on the shared Spotify rate limiter before sending each request"""
+    def send(self, request, **kwargs):
+        _spotify_rate_limiter.acquire()
+        return super().send(request, **kwargs)
+
+class SessionTokenCacheHandler(CacheHandler):
+    """Keep the OAuth token in a per-session dict instead of a token file shared by every user"""
+    def __init__(self, store):
+        # A plain dict held in session state, so worker threads can refresh tokens without st.session_state
+        self.store = store
+    
+    def get_cached_token(self):
+        return self.store.get('token_info')
+    
+    def save_token_to_cache(self, token_info):
+        self.store['token_info'] = token_info
+
+class OrjsonResponse(requests.Response):
+    """Response whose json() decodes with orjson"""
+    def json(self, **kwargs):
+        # orjson.JSONDecodeError subclasses ValueError, so spotipy's empty-body handling still applies
+        return orjson.loads(self.content)
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """Decode JSON bodies with orjson when spotipy calls response.json()"""
+    # Swapping the class adds no per-response state, unlike assigning response.json, whose
+    # closure or bound method would make every response a reference cycle that outlives its body
+    response.__class__ = OrjsonResponse
+    return response
+
+def _build_requests_session():
+    """Create an HTTP session that keeps connections alive and retries throttled or failed requests"""
+    session = requests.Session()
+    # POST is included so token refreshes are retried too; 429s wait out Spotify's Retry-After
+    retry = Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET', 'POST'],
+        respect_retry_after_header=True
+    )
+    session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry))
+    # Web API calls are additionally paced client-side; token and CDN requests are not
+    session.mount('https://api.spotify.com/', RateLimitedAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry))
+    # Scoped to our sessions rather than patching requests' json module for the whole process
+    session.hooks['response'].append(_orjson_response_hook)
+    return session
+
+# Client Credentials tokens aren't tied to a user, so one client can serve every session
+@st.cache_resource(show_spinner=False)
+def _client_credentials_client(client_id, client_secret):
+    """Create one app-level Spotify client per set of credentials"""
+    session = _build_requests_session()
+    client_credentials_manager = SpotifyClientCredentials(
+        client_id=client_id,
+        client_secret=client_secret,
+        requests_session=session
+    )
+    return spotipy.Spotify(client_credentials_manager=client_credentials_manager, requests_session=session)
+
+# Audio analyses never change, so they are also kept on disk to survive restarts and new sessions
+_analysis_disk_cache = diskcache.Cache('.spotify_cache/audio_analysis')
+
+def _tracks_frame(spotify_tracks):
+    """Build a label-indexed DataFrame of the tracks that have a preview available"""
+    names, artists, ids, preview_urls, popularities, durations = [], [], [], [], [], []
+    for track in spotify_tracks:
+        if track:  # Playlist items can hold removed or local tracks
+            names.append(track['name'])
+            artists.append(', '.join([artist['name'] for artist in track['artists']]))
+            ids.append(track['id'])
+            preview_urls.append(track['preview_url'])
+            popularities.append(track['popularity'])
+            durations.append(track['duration_ms'])
+    
+    tracks = pd.DataFrame({
+        'name': names,
+        'artist': artists,
+        'id': ids,
+        'preview_url': preview_urls,
+        'popularity': popularities,
+        'duration_ms': durations
+    }, columns=_TRACK_COLUMNS)
+    tracks = tracks[tracks['preview_url'].notna()]  # Only include tracks with preview
+    
+    # Empty columns come out as float64, which can't be concatenated into labels
+    if tracks.empty:
+        return tracks
+    
+    # Index by display label for O(1) selection; the first track wins when labels repeat
+    tracks = tracks.set_index(tracks['name'] + ' - ' + tracks['artist'])
+    return tracks[~tracks.index.duplicated()]
+
+# Cached Spotify calls: the leading underscore on `_sp` tells Streamlit not to hash the client,
+# so results are keyed on the IDs alone and shared across reruns and sessions
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_user_playlists(_sp, user_id):
+    """Fetch all of a user's playlists as {name: id}"""
+    playlist_ids = {}
+    for playlist in _fetch_all_pages(_sp.current_user_playlists, _USER_PLAYLISTS_PAGE_SIZE):
+        playlist_ids.setdefault(playlist['name'], playlist['id'])  # The first playlist wins when names repeat
+    return playlist_ids
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_playlist_tracks(_sp, playlist_id):
+    """Fetch every track of a playlist that has a preview available"""
+    items = _fetch_all_pages(
+        lambda limit, offset: _sp.playlist_items(playlist_id, fields=_PLAYLIST_TRACK_FIELDS,
+                                                 limit=limit, offset=offset, additional_types=('track',)),
+        _PLAYLIST_TRACKS_PAGE_SIZE
+    )
+    return _tracks_frame(item['track'] for item in items)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _search_tracks(_sp, query, limit):
+    """Search for tracks that have a preview available"""
+    results = _sp.search(q=query, type='track', limit=limit)
+    return _tracks_frame(results['tracks']['items'])
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_audio_features(_sp, track_id):
+    """Fetch audio features for a single track"""
+    return _sp.audio_features([track_id])[0]
+
+# Only recent analyses stay in memory; the disk tier serves the rest
+@st.cache_data(ttl=86400, max_entries=32, show_spinner=False)
+def _fetch_audio_analysis(_sp, track_id):
+    """Fetch audio analysis for a track - immutable per track ID, so cached for a day"""
+    analysis = _analysis_disk_cache.get(track_id)
+    if analysis is None:
+        analysis = _sp.audio_analysis(track_id)
+        _analysis_disk_cache.set(track_id, analysis)
+    return analysis
+
+@st.cache_resource(show_spinner=False)
+def _preview_session():
+    """Pooled HTTP session for downloading preview clips from Spotify's CDN"""
+    return _build_requests_session()
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _fetch_preview_audio(preview_url):
+    """Download a 30-second preview MP3 so the browser doesn't have to fetch it again"""
+    response = _preview_session().get(preview_url, timeout=10)
+    response.raise_for_status()
+    return response.content
 
 class SpotifyVisualizer:
     def __init__(self):
@@ -70,17 +291,17 @@ class SpotifyVisualizer:
         self.current_track = None
         self.audio_features = None
         self.audio_analysis = None
+        self.user_id = None
+        self._features_cache = {}
+        self._failed_feature_ids = set()
+        self._session = None
         
     def authenticate(self, client_id, client_secret, redirect_uri=None, use_client_credentials=False):
         """Authenticate with Spotify API - supports both OAuth and Client Credentials"""
         try:
             if use_client_credentials:
                 # Use Client Credentials flow (no user auth, limited access)
-                client_credentials_manager = SpotifyClientCredentials(
-                    client_id=client_id,
-                    client_secret=client_secret
-                )
-                self.sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
+                self.sp = _client_credentials_client(client_id, client_secret)
                 st.info("⚠️ Using Client Credentials mode - some features (playlists, currently playing) won't be available")
             else:
                 # Use Authorization Code flow with proper redirect URI
@@ -96,20 +317,24 @@ class SpotifyVisualizer:
                         # Local development
                         redirect_uri = "https://localhost:8501/callback"
                 
+                # One pooled session carries both token and API requests, and outlives logout
+                if self._session is None:
+                    self._session = _build_requests_session()
                 auth_manager = SpotifyOAuth(
                     client_id=client_id,
                     client_secret=client_secret,
                     redirect_uri=redirect_uri,
                     scope=scope,
-                    cache_path=None,
+                    cache_handler=SessionTokenCacheHandler(st.session_state.setdefault('spotify_token_cache', {})),
                     show_dialog=True,
-                    open_browser=False  # Important for Streamlit Cloud
+                    open_browser=False,  # Important for Streamlit Cloud
+                    requests_session=self._session
                 )
                 
-                self.sp = spotipy.Spotify(auth_manager=auth_manager)
+                self.sp = spotipy.Spotify(auth_manager=auth_manager, requests_session=self._session)
             
             # Test the connection
-            self.sp.current_user()
+            self.user_id = self.sp.current_user()['id']
             return True
             
         except Exception as e:
@@ -121,6 +346,15 @@ class SpotifyVisualizer:
                 st.error(f"Authentication failed: {error_msg}")
                 return False
     
+    def logout(self):
+        """Drop the Spotify client and track state, keeping warm connections for a reconnect"""
+        self.sp = None
+        self.user_id = None
+        self.current_track = None
+        self.audio_features = None
+        self.audio_analysis = None
+        self._failed_feature_ids.clear()
+    
     def authenticate_with_secrets(self):
         """Authenticate using Streamlit secrets for cloud deployment"""
         try:
@@ -140,77 +374,115 @@ class SpotifyVisualizer:
             return False
     
     def get_user_playlists(self):
-        """Get user's playlists"""
+        """Get user's playlists as {name: id}"""
         if not self.sp:
-            return []
+            return {}
         
         try:
-            playlists = self.sp.current_user_playlists()
-            return [(playlist['name'], playlist['id']) for playlist in playlists['items']]
+            return _fetch_user_playlists(self.sp, self.user_id)
         except Exception as e:
             st.error(f"Failed to fetch playlists: {str(e)}")
-            return []
+            return {}
     
     def get_playlist_tracks(self, playlist_id):
-        """Get tracks from a playlist"""
+        """Get tracks from a playlist as a DataFrame indexed by "name - artist" label"""
         if not self.sp:
-            return []
+            return pd.DataFrame(columns=_TRACK_COLUMNS)
         
         try:
-            results = self.sp.playlist_tracks(playlist_id)
-            tracks = []
-            for item in results['items']:
-                track = item['track']
-                if track and track['preview_url']:  # Only include tracks with preview
-                    tracks.append({
-                        'name': track['name'],
-                        'artist': ', '.join([artist['name'] for artist in track['artists']]),
-                        'id': track['id'],
-                        'preview_url': track['preview_url'],
-                        'popularity': track['popularity'],
-                        'duration_ms': track['duration_ms']
-                    })
-            return tracks
+            return _fetch_playlist_tracks(self.sp, playlist_id)
         except Exception as e:
             st.error(f"Failed to fetch playlist tracks: {str(e)}")
-            return []
+            return pd.DataFrame(columns=_TRACK_COLUMNS)
     
     def search_tracks(self, query, limit=20):
         """Search for tracks - works with Client Credentials"""
         if not self.sp:
-            return []
+            return pd.DataFrame(columns=_TRACK_COLUMNS)
         
         try:
-            results = self.sp.search(q=query, type='track', limit=limit)
-            tracks = []
-            for track in results['tracks']['items']:
-                if track['preview_url']:  # Only include tracks with preview
-                    tracks.append({
-                        'name': track['name'],
-                        'artist': ', '.join([artist['name'] for artist in track['artists']]),
-                        'id': track['id'],
-                        'preview_url': track['preview_url'],
-                        'popularity': track['popularity'],
-                        'duration_ms': track['duration_ms']
-                    })
-            return tracks
+            return _search_tracks(self.sp, query, limit)
         except Exception as e:
             st.error(f"Failed to search tracks: {str(e)}")
-            return []
+            return pd.DataFrame(columns=_TRACK_COLUMNS)
+    
+    def _fetch_features_batch(self, track_ids):
+        """Fetch audio features for up to 100 IDs in one request"""
+        try:
+            return self.sp.audio_features(track_ids)
+        except spotipy.SpotifyException as e:
+            # A 400 can mean the batch was too large; retry it in smaller slices
+            if e.http_status != 400 or len(track_ids) <= _AUDIO_FEATURES_FALLBACK_BATCH_SIZE:
+                raise
+            return list(chain.from_iterable(
+                self.sp.audio_features(track_ids[start:start + _AUDIO_FEATURES_FALLBACK_BATCH_SIZE])
+                for start in range(0, len(track_ids), _AUDIO_FEATURES_FALLBACK_BATCH_SIZE)
+            ))
     
-    def get_track_features(self, track_id):
-        """Get audio features for a track"""
+    def get_tracks_features_bulk(self, track_ids):
+        """Batch-fetch audio features for many tracks, 100 IDs per request, as {track_id: features}"""
         if not self.sp:
-            return None
+            return {}
+        
+        # Deduplicate while preserving order and skip anything already fetched or already failed
+        missing = [tid for tid in dict.fromkeys(track_ids)
+                   if tid not in self._features_cache and tid not in self._failed_feature_ids]
+        batches = [missing[start:start + _AUDIO_FEATURES_BATCH_SIZE]
+                   for start in range(0, len(missing), _AUDIO_FEATURES_BATCH_SIZE)]
+        if batches:
+            # Batches are independent, so fetch them in parallel; the pool size bounds in-flight requests
+            with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_REQUESTS, len(batches))) as executor:
+                futures = [(batch, executor.submit(self._fetch_features_batch, batch)) for batch in batches]
+            for batch, future in futures:
+                try:
+                    # Tracks without features come back as null; caching those too stops reruns re-requesting them
+                    self._features_cache.update(zip(batch, future.result()))
+                except Exception:
+                    # Bulk fetching is best-effort and get_track_features still tries these one at a time,
+                    # but remember the failure so every rerun doesn't repeat the same batch
+                    self._failed_feature_ids.update(batch)
+        
+        return {tid: self._features_cache[tid] for tid in track_ids if self._features_cache.get(tid)}
+    
+    def get_track_features(self, track_id, preview_url=None):
+        """Get audio features and preview audio for a track, fetched concurrently"""
+        if not self.sp:
+            return None, None
         
         try:
-            features = self.sp.audio_features(track_id)[0]
-            analysis = self.sp.audio_analysis(track_id)
-            return features, analysis
+            with _script_context_executor(max_workers=2) as executor:
+                # A cached None means Spotify has no features for this track, so don't ask again
+                features_future = executor.submit(
+                    lambda: self._features_cache[track_id] if track_id in self._features_cache
+                    else _fetch_audio_features(self.sp, track_id)
+                )
+                preview_future = executor.submit(_fetch_preview_audio, preview_url) if preview_url else None
+            
+            preview_audio = None
+            if preview_future:
+                try:
+                    preview_audio = preview_future.result()
+                except requests.RequestException:
+                    pass  # The player falls back to streaming preview_url
+            features = features_future.result()
+            # Later bulk fetches (e.g. a playlist containing this track) can then skip it, hit or miss
+            self._features_cache[track_id] = features
+            return features, preview_audio
         except Exception as e:
             st.error(f"Failed to fetch track features: {str(e)}")
             return None, None
     
+    def get_track_analysis(self, track_id):
+        """Get the audio analysis for a track - large, so it's only fetched once the track is on screen"""
+        if not self.sp:
+            return None
+        
+        try:
+            return _fetch_audio_analysis(self.sp, track_id)
+        except Exception as e:
+            st.error(f"Failed to fetch track analysis: {str(e)}")
+            return None
+    
     def get_currently_playing(self):
         """Get currently playing track"""
         if not self.sp:
@@ -231,93 +503,172 @@ class SpotifyVisualizer:
             st.error(f"Failed to fetch currently playing: {str(e)}")
         return None
 
-def create_audio_visualizations(features, analysis, track_info):
+# Upper bound on points per trace for plots that sample the whole track
+_MAX_PLOT_POINTS = 200
+_MAX_WAVEFORM_POINTS = 800
+
+# Plot labels and palettes shared by every redraw
+_PITCH_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+_AUDIO_ATTRS = ('danceability', 'energy', 'speechiness', 'acousticness', 'instrumentalness', 'liveness', 'valence')
+_AUDIO_ATTR_LABELS = tuple(attr.capitalize() for attr in _AUDIO_ATTRS)
+_VIRIDIS_12 = tuple(px.colors.sample_colorscale('Viridis', len(_PITCH_NAMES)))
+_TEMPO_GAUGE_STEPS = (
+    {'range': [0, 60], 'color': "lightgray"},
+    {'range': [60, 120], 'color': "gray"},
+    {'range': [120, 200], 'color': "darkgray"}
+)
+
+def _decimation_indices(n_items, max_points):
+    """Indices of at most max_points evenly spaced items spanning a sequence of n_items"""
+    if n_items <= max_points:
+        return np.arange(n_items)
+    return np.linspace(0, n_items - 1, num=max_points, dtype=np.int64)
+
+# Values in [0, 1] are stored as uint8 steps of 1/255 to keep per-session memory small
+_UNIT_SCALE = 255
+
+def _quantize_unit(values):
+    """Pack [0, 1] floats into uint8"""
+    return np.rint(np.clip(values, 0, 1) * _UNIT_SCALE).astype(np.uint8)
+
+def _dequantize_unit(values):
+    """Unpack uint8 steps (or sums of them) back into float32 on the [0, 1] scale"""
+    return values.astype(np.float32) / _UNIT_SCALE
+
+def _feature_vector(features):
+    """Values of the radar/bar audio features, in _AUDIO_ATTRS order"""
+    return np.fromiter((features.get(attr, 0) for attr in _AUDIO_ATTRS), dtype=np.float32, count=len(_AUDIO_ATTRS))
+
+# Scalar fields read from each segment dict in a single pass
+_SEGMENT_SCALARS = np.dtype([('start', np.float32), ('loudness_max', np.float32), ('confidence', np.float32)])
+
+def _segments_to_soa(segments):
+    """Convert analysis segment dicts into compact columnar arrays shared by every visualization"""
+    n_segments = len(segments)
+    scalars = np.fromiter(
+        ((seg['start'], seg['loudness_max'], seg.get('confidence', 0)) for seg in segments),
+        dtype=_SEGMENT_SCALARS, count=n_segments
+    )
+    pitches = np.array([seg.get('pitches') or [0] * 12 for seg in segments],
+                       dtype=np.float32).reshape(n_segments, len(_PITCH_NAMES))
+    # Time stays float32: float16 can't resolve seconds late into a long track
+    return {
+        'start': np.ascontiguousarray(scalars['start']),
+        'loudness_max': scalars['loudness_max'].astype(np.float16),
+        'pitches': _quantize_unit(pitches),
+        'confidence': _quantize_unit(scalars['confidence'])
+    }
+
+# Numeric kernels over the columnar segment arrays
+def _pitch_class_totals(pitches):
+    """Sum an (N, 12) pitch matrix down each pitch-class column"""
+    return pitches.sum(axis=0, dtype=np.float32)
+
+def _pitch_row_sums(pitches):
+    """Sum an (N, 12) pitch matrix across each segment's row"""
+    return pitches.sum(axis=1, dtype=np.float32)
+
+def _shift_to_zero(values):
+    """Offset a non-empty array so its minimum becomes zero"""
+    return (values - values.min()).astype(np.float32, copy=False)
+
+def _radar_trace(data):
+    """Audio features radar chart"""
+    return go.Scatterpolar(
+        r=data.feature_vector,
+        theta=_AUDIO_ATTRS,
+        fill='toself',
+        fillcolor='rgba(29, 185, 84, 0.3)',
+        line=dict(color='#1DB954', width=3),
+        name='Audio Features'
+    )
+
+def _pitch_bar_trace(data):
+    """Frequency analysis (simulated from segments)"""
+    # Pitches are already chroma vectors indexed by pitch class, so sum each column
+    freq_bins = _dequantize_unit(_pitch_class_totals(data.segments['pitches']))
+    
+    return go.Bar(
+        x=_PITCH_NAMES,
+        y=freq_bins,
+        marker_color=_VIRIDIS_12,
+        name='Pitch Distribution'
+    )
+
+def _beat_timeline_trace(data):
+    """Beat confidence over time"""
+    # Evenly spaced beats across the track
+    beats = [data.analysis['beats'][i] for i in _decimation_indices(len(data.analysis['beats']), _MAX_PLOT_POINTS)]
+    n_beats = len(beats)
+    beat_times = np.fromiter((beat['start'] for beat in beats), dtype=np.float32, count=n_beats)
+    beat_confidence = np.fromiter((beat['confidence'] for beat in beats), dtype=np.float32, count=n_beats)
+    
+    return go.Scatter(
+        x=beat_times,
+        y=beat_confidence,
+        mode='markers+lines',
+        marker=dict(
+            size=8,
+            color=beat_confidence,
+            colorscale='Viridis',
+            showscale=True
+        ),
+        line=dict(color='#1DB954', width=2),
+        name='Beat Confidence'
+    )
+
+def _tempo_gauge_trace(data):
+    """Tempo & energy gauge"""
+    return go.Indicator(
+        mode="gauge+number+delta",
+        value=data.features.get('tempo', 0),
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Tempo (BPM)"},
+        delta={'reference': 120},
+        gauge={
+            'axis': {'range': [None, 200]},
+            'bar': {'color': "#1DB954"},
+            'steps': _TEMPO_GAUGE_STEPS,
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': data.features.get('energy', 0) * 200
+            }
+        }
+    )
+
+# Multi-view grid layout, in row-major order
+_MULTI_VIEW_TITLES = ('Audio Features Radar', 'Frequency Analysis', 'Beat Timeline', 'Tempo & Energy')
+_MULTI_VIEW_SPECS = ([{"type": "scatterpolar"}, {"type": "bar"}],
+                     [{"type": "scatter"}, {"type": "indicator"}])
+
+# Everything a multi-view panel may draw from, passed to its builder and guard as one argument
+_PanelData = namedtuple('_PanelData', 'features feature_vector analysis segments')
+
+# Multi-view panels as (trace builder, guard on the available data, row, col)
+_MULTI_VIEW_PANELS = (
+    (_radar_trace, lambda data: bool(data.features), 1, 1),
+    (_pitch_bar_trace, lambda data: bool(data.segments) and len(data.segments['pitches']) > 0, 1, 2),
+    (_beat_timeline_trace, lambda data: bool(data.analysis) and 'beats' in data.analysis, 2, 1),
+    (_tempo_gauge_trace, lambda data: bool(data.features), 2, 2)
+)
+
+def create_audio_visualizations(features, feature_vector, analysis, track_info, segments):
     """Create various audio visualizations"""
     
     # Create subplot layout
     fig = make_subplots(
         rows=2, cols=2,
-        subplot_titles=('Audio Features Radar', 'Frequency Analysis', 'Beat Timeline', 'Tempo & Energy'),
-        specs=[[{"type": "scatterpolar"}, {"type": "bar"}],
-               [{"type": "scatter"}, {"type": "indicator"}]]
+        subplot_titles=_MULTI_VIEW_TITLES,
+        specs=_MULTI_VIEW_SPECS
     )
     
-    # 1. Audio Features Radar Chart
-    if features:
-        audio_attrs = ['danceability', 'energy', 'speechiness', 'acousticness', 'instrumentalness', 'liveness', 'valence']
-        values = [features.get(attr, 0) for attr in audio_attrs]
-        
-        fig.add_trace(go.Scatterpolar(
-            r=values,
-            theta=audio_attrs,
-            fill='toself',
-            fillcolor='rgba(29, 185, 84, 0.3)',
-            line=dict(color='#1DB954', width=3),
-            name='Audio Features'
-        ), row=1, col=1)
-    
-    # 2. Frequency Analysis (simulated from segments)
-    if analysis and 'segments' in analysis:
-        segments = analysis['segments'][:50]  # First 50 segments
-        frequencies = []
-        for segment in segments:
-            if 'pitches' in segment:
-                frequencies.extend(segment['pitches'])
-        
-        if frequencies:
-            freq_bins = np.histogram(frequencies, bins=12)[0]
-            pitch_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-            
-            fig.add_trace(go.Bar(
-                x=pitch_names,
-                y=freq_bins,
-                marker_color=px.colors.sequential.Viridis,
-                name='Pitch Distribution'
-            ), row=1, col=2)
-    
-    # 3. Beat Timeline
-    if analysis and 'beats' in analysis:
-        beats = analysis['beats'][:100]  # First 100 beats
-        beat_times = [beat['start'] for beat in beats]
-        beat_confidence = [beat['confidence'] for beat in beats]
-        
-        fig.add_trace(go.Scatter(
-            x=beat_times,
-            y=beat_confidence,
-            mode='markers+lines',
-            marker=dict(
-                size=8,
-                color=beat_confidence,
-                colorscale='Viridis',
-                showscale=True
-            ),
-            line=dict(color='#1DB954', width=2),
-            name='Beat Confidence'
-        ), row=2, col=1)
-    
-    # 4. Tempo & Energy Gauge
-    if features:
-        fig.add_trace(go.Indicator(
-            mode="gauge+number+delta",
-            value=features.get('tempo', 0),
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Tempo (BPM)"},
-            delta={'reference': 120},
-            gauge={
-                'axis': {'range': [None, 200]},
-                'bar': {'color': "#1DB954"},
-                'steps': [
-                    {'range': [0, 60], 'color': "lightgray"},
-                    {'range': [60, 120], 'color': "gray"},
-                    {'range': [120, 200], 'color': "darkgray"}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': features.get('energy', 0) * 200
-                }
-            }
-        ), row=2, col=2)
+    # Build only the panels whose data is present, then add them in one batch so Plotly validates once
+    data = _PanelData(features, feature_vector, analysis, segments)
+    panels = [(build(data), row, col) for build, guard, row, col in _MULTI_VIEW_PANELS if guard(data)]
+    if panels:
+        traces, rows, cols = zip(*panels)
+        fig.add_traces(list(traces), rows=list(rows), cols=list(cols))
     
     # Update layout
     fig.update_layout(
@@ -331,27 +682,24 @@ def create_audio_visualizations(features, analysis, track_info):
     
     return fig
 
-def create_waveform_visualization(analysis):
-    """Create a waveform-like visualization from audio analysis"""
-    if not analysis or 'segments' not in analysis:
+def create_waveform_visualization(segments):
+    """Create a waveform-like visualization from columnar segment data"""
+    if not segments or not len(segments['start']):
         return None
     
-    segments = analysis['segments']
-    
-    # Extract segment data
-    times = [seg['start'] for seg in segments]
-    loudness = [seg['loudness_max'] for seg in segments]
+    # Evenly spaced segments keep the payload sent to the browser bounded for long tracks
+    indices = _decimation_indices(len(segments['start']), _MAX_WAVEFORM_POINTS)
+    times = segments['start'][indices]
     
     # Normalize loudness to positive values
-    min_loudness = min(loudness)
-    normalized_loudness = [(l - min_loudness) for l in loudness]
+    loudness = _shift_to_zero(segments['loudness_max'][indices].astype(np.float32))
     
     fig = go.Figure()
     
-    # Create waveform
-    fig.add_trace(go.Scatter(
+    # Create waveform; Scattergl draws to a WebGL canvas, which stays smooth with thousands of points
+    fig.add_trace(go.Scattergl(
         x=times,
-        y=normalized_loudness,
+        y=loudness,
         mode='lines',
         fill='tonexty',
         fillcolor='rgba(29, 185, 84, 0.3)',
@@ -374,18 +722,18 @@ def create_waveform_visualization(analysis):
     
     return fig
 
-def create_3d_visualization(features, analysis):
+def create_3d_visualization(features, segments):
     """Create 3D visualization of audio features"""
-    if not analysis or 'segments' not in analysis:
+    if not segments or not len(segments['start']):
         return None
     
-    segments = analysis['segments'][:100]  # Limit for performance
+    indices = _decimation_indices(len(segments['start']), _MAX_PLOT_POINTS)  # Limit for performance
     
-    x = [seg['start'] for seg in segments]
-    y = [seg['loudness_max'] for seg in segments]
-    z = [sum(seg.get('pitches', [0])) for seg in segments]
+    x = segments['start'][indices]
+    y = segments['loudness_max'][indices].astype(np.float32)
+    z = _dequantize_unit(_pitch_row_sums(segments['pitches'][indices]))
     
-    colors = [seg.get('confidence', 0) for seg in segments]
+    colors = _dequantize_unit(segments['confidence'][indices])
     
     fig = go.Figure(data=[go.Scatter3d(
         x=x,
@@ -416,7 +764,143 @@ def create_3d_visualization(features, analysis):
     
     return fig
 
+def create_feature_bar(feature_vector):
+    """Create a bar chart of the audio feature values"""
+    df = pd.DataFrame({'Feature': _AUDIO_ATTR_LABELS, 'Value': feature_vector})
+    
+    fig = px.bar(df, x='Feature', y='Value', 
+                 color='Value', color_continuous_scale='viridis',
+                 title="Audio Feature Values")
+    fig.update_layout(template="plotly_dark", 
+                      paper_bgcolor='rgba(0,0,0,0)')
+    
+    return fig
+
+# Figures depend only on the track, so cache them by track ID; the underscored inputs aren't hashed
+@st.cache_data(max_entries=32, show_spinner=False)
+def _audio_visualizations_figure(track_id, _features, _feature_vector, _analysis, _track_info, _segments):
+    """create_audio_visualizations, cached per track"""
+    return create_audio_visualizations(_features, _feature_vector, _analysis, _track_info, _segments)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _waveform_figure(track_id, _segments):
+    """create_waveform_visualization, cached per track"""
+    return create_waveform_visualization(_segments)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _3d_figure(track_id, _features, _segments):
+    """create_3d_visualization, cached per track"""
+    return create_3d_visualization(_features, _segments)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _feature_bar_figure(track_id, _feature_vector):
+    """create_feature_bar, cached per track"""
+    return create_feature_bar(_feature_vector)
+
+def _set_current_track(track, features, preview_audio=None):
+    """Store the selected track in session state; its analysis is loaded separately"""
+    st.session_state.current_track = track
+    st.session_state.current_features = features
+    st.session_state.current_feature_vector = _feature_vector(features) if features else None
+    st.session_state.current_preview_audio = preview_audio
+    st.session_state.current_analysis = None
+    st.session_state.current_segments_soa = None
+    st.session_state.analysis_loaded = False
+
+def _set_current_analysis(analysis):
+    """Store what the UI needs from the current track's analysis, converting its segments to columns once"""
+    # The raw segment dicts are most of an analysis, so sessions keep only their quantized columns,
+    # the beats for the timeline and the counts for the summary
+    st.session_state.current_analysis = {
+        'beats': analysis.get('beats', []),
+        'section_count': len(analysis.get('sections', [])),
+        'segment_count': len(analysis.get('segments', []))
+    } if analysis else None
+    st.session_state.current_segments_soa = (
+        _segments_to_soa(analysis['segments']) if analysis and 'segments' in analysis else None
+    )
+    st.session_state.analysis_loaded = True
+
+def _render_visualizations(track, features, feature_vector, analysis, segments):
+    """Render the visualization tabs from the per-track figure caches"""
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Multi-View", "🌊 Waveform", "🌐 3D Analysis", "📈 Detailed Features"])
+    
+    with tab1:
+        if features and analysis:
+            fig = _audio_visualizations_figure(track['id'], features, feature_vector, analysis, track, segments)
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with tab2:
+        if analysis:
+            waveform_fig = _waveform_figure(track['id'], segments)
+            if waveform_fig:
+                st.plotly_chart(waveform_fig, use_container_width=True)
+            else:
+                st.info("Waveform data not available for this track")
+    
+    with tab3:
+        if analysis:
+            fig_3d = _3d_figure(track['id'], features, segments)
+            if fig_3d:
+                st.plotly_chart(fig_3d, use_container_width=True)
+            else:
+                st.info("3D visualization data not available")
+    
+    with tab4:
+        if features:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Audio Features")
+                fig_bar = _feature_bar_figure(track['id'], feature_vector)
+                st.plotly_chart(fig_bar, use_container_width=True)
+            
+            with col2:
+                st.subheader("Technical Details")
+                st.write(f"**Key:** {features['key']}")
+                st.write(f"**Mode:** {'Major' if features['mode'] == 1 else 'Minor'}")
+                st.write(f"**Time Signature:** {features['time_signature']}/4")
+                st.write(f"**Tempo:** {features['tempo']:.1f} BPM")
+                st.write(f"**Duration:** {features['duration_ms'] / 1000:.1f} seconds")
+                st.write(f"**Loudness:** {features['loudness']:.1f} dB")
+                
+                if analysis:
+                    st.subheader("Analysis Summary")
+                    st.write(f"**Sections:** {analysis['section_count']}")
+                    st.write(f"**Segments:** {analysis['segment_count']}")
+                    st.write(f"**Beats:** {len(analysis['beats'])}")
+
+def _now_playing_fragment(following):
+    """Load or follow the currently playing track; run as a fragment, so each poll reruns only this block"""
+    get_clicked = st.button("🔄 Get Currently Playing")
+    if not following and not get_clicked:
+        return
+    
+    current = st.session_state.visualizer.get_currently_playing()
+    if not current:
+        st.info("No track currently playing")
+        return
+    
+    st.session_state.current_playing = current
+    st.caption(f"{current['name']} - {current['artist']}")
+    
+    # A click always loads the track, while following only analyzes a track change;
+    # either way the whole app then reruns so the main area shows it
+    if get_clicked or current['id'] != st.session_state.get('last_np_id'):
+        st.session_state.last_np_id = current['id']
+        with st.spinner("Analyzing currently playing track..."):
+            features, preview_audio = st.session_state.visualizer.get_track_features(
+                current['id'], current.get('preview_url')
+            )
+        if features:
+            _set_current_track(current, features, preview_audio)
+            st.rerun()
+
 def main():
+    # Streamlit drops elements a rerun doesn't emit again, so the stylesheet is sent every run;
+    # unchanged, it's diffed away in the browser rather than re-applied
+    st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
+    
     # Initialize session state
     if 'visualizer' not in st.session_state:
         st.session_state.visualizer = SpotifyVisualizer()
@@ -453,21 +937,26 @@ def main():
                 help="OAuth provides full access but may have port conflicts. Client Credentials provides limited access but is more reliable."
             )
             
-            client_id = st.text_input("Spotify Client ID", type="password", 
-                                    help="Get this from your Spotify Developer Dashboard")
-            client_secret = st.text_input("Spotify Client Secret", type="password",
-                                        help="Keep this secret and secure")
-            
-            if auth_method == "Full Access (OAuth)":
-                redirect_uri = st.text_input("Redirect URI", value="http://localhost:8501/callback",
-                                           help="Must match your Spotify app settings")
-                use_client_credentials = False
-            else:
-                redirect_uri = None
-                use_client_credentials = True
-                st.info("Client Credentials mode: Can search and analyze any track, but cannot access personal playlists or currently playing.")
+            # Typing credentials doesn't rerun the script; only submitting the form does.
+            # The radio stays outside so switching methods can show or hide the redirect URI.
+            with st.form("auth_form"):
+                client_id = st.text_input("Spotify Client ID", type="password", 
+                                        help="Get this from your Spotify Developer Dashboard")
+                client_secret = st.text_input("Spotify Client Secret", type="password",
+                                            help="Keep this secret and secure")
+                
+                if auth_method == "Full Access (OAuth)":
+                    redirect_uri = st.text_input("Redirect URI", value="http://localhost:8501/callback",
+                                               help="Must match your Spotify app settings")
+                    use_client_credentials = False
+                else:
+                    redirect_uri = None
+                    use_client_credentials = True
+                    st.info("Client Credentials mode: Can search and analyze any track, but cannot access personal playlists or currently playing.")
+                
+                connect_clicked = st.form_submit_button("🎵 Connect to Spotify")
             
-            if st.button("🎵 Connect to Spotify"):
+            if connect_clicked:
                 if client_id and client_secret:
                     if st.session_state.visualizer.authenticate(client_id, client_secret, redirect_uri, use_client_credentials):
                         st.session_state.authenticated = True
@@ -484,7 +973,9 @@ def main():
             
             if st.button("🔓 Disconnect"):
                 st.session_state.authenticated = False
-                st.session_state.visualizer = SpotifyVisualizer()
+                st.session_state.pop('spotify_token_cache', None)
+                st.session_state.pop('last_np_id', None)
+                st.session_state.visualizer.logout()
                 st.rerun()
             
             st.markdown("---")
@@ -496,75 +987,68 @@ def main():
                 # Full access - show playlists and currently playing
                 playlists = st.session_state.visualizer.get_user_playlists()
                 if playlists:
-                    playlist_names = [name for name, _ in playlists]
-                    selected_playlist = st.selectbox("Choose Playlist", playlist_names)
+                    selected_playlist = st.selectbox("Choose Playlist", list(playlists))
                     
                     if selected_playlist:
-                        playlist_id = next(pid for name, pid in playlists if name == selected_playlist)
+                        playlist_id = playlists[selected_playlist]
                         tracks = st.session_state.visualizer.get_playlist_tracks(playlist_id)
                         
-                        if tracks:
-                            track_names = [f"{track['name']} - {track['artist']}" for track in tracks]
-                            selected_track_name = st.selectbox("Choose Track", track_names)
+                        if not tracks.empty:
+                            # Features for the whole playlist arrive up front; analysis waits until a track is shown
+                            st.session_state.visualizer.get_tracks_features_bulk(tracks['id'].tolist())
+                            selected_track_name = st.selectbox("Choose Track", tracks.index)
                             
                             if selected_track_name:
-                                selected_track = next(track for track in tracks 
-                                                    if f"{track['name']} - {track['artist']}" == selected_track_name)
+                                selected_track = tracks.loc[selected_track_name].to_dict()
                                 
                                 if st.button("🎯 Analyze Track"):
                                     with st.spinner("Analyzing track..."):
-                                        features, analysis = st.session_state.visualizer.get_track_features(selected_track['id'])
+                                        features, preview_audio = st.session_state.visualizer.get_track_features(
+                                            selected_track['id'], selected_track.get('preview_url')
+                                        )
                                         if features:
-                                            st.session_state.current_track = selected_track
-                                            st.session_state.current_features = features
-                                            st.session_state.current_analysis = analysis
+                                            _set_current_track(selected_track, features, preview_audio)
                                             st.success("Track analyzed successfully!")
                 
                 st.markdown("---")
                 
                 # Currently playing
                 st.header("🎵 Now Playing")
-                if st.button("🔄 Get Currently Playing"):
-                    current = st.session_state.visualizer.get_currently_playing()
-                    if current:
-                        st.session_state.current_playing = current
-                        with st.spinner("Analyzing currently playing track..."):
-                            features, analysis = st.session_state.visualizer.get_track_features(current['id'])
-                            if features:
-                                st.session_state.current_track = current
-                                st.session_state.current_features = features
-                                st.session_state.current_analysis = analysis
-                    else:
-                        st.info("No track currently playing")
+                following = st.toggle("Follow currently playing", key='follow_now_playing')
+                if not following:
+                    st.session_state.pop('last_np_id', None)  # Pick the current track up again when re-enabled
+                # Only sessions that follow the player poll; otherwise the fragment reruns just for its button
+                st.fragment(_now_playing_fragment, run_every='5s' if following else None)(following)
                 
                 st.markdown("---")
             
             # Search (works in both modes)
             st.header("🔍 Search Tracks")
-            search_query = st.text_input("Search for a song or artist:")
-            if search_query and st.button("🔍 Search"):
+            with st.form("search_form"):
+                search_query = st.text_input("Search for a song or artist:")
+                search_clicked = st.form_submit_button("🔍 Search")
+            
+            if search_clicked and search_query:
                 with st.spinner("Searching..."):
                     search_results = st.session_state.visualizer.search_tracks(search_query)
-                    if search_results:
+                    if not search_results.empty:
                         st.session_state.search_results = search_results
                         st.success(f"Found {len(search_results)} tracks!")
                     else:
                         st.info("No tracks found")
             
-            if hasattr(st.session_state, 'search_results') and st.session_state.search_results:
-                track_names = [f"{track['name']} - {track['artist']}" for track in st.session_state.search_results]
-                selected_search_track = st.selectbox("Choose from search results:", track_names)
+            if 'search_results' in st.session_state and not st.session_state.search_results.empty:
+                selected_search_track = st.selectbox("Choose from search results:", st.session_state.search_results.index)
                 
                 if selected_search_track and st.button("🎯 Analyze Search Result"):
-                    selected_track = next(track for track in st.session_state.search_results 
-                                        if f"{track['name']} - {track['artist']}" == selected_search_track)
+                    selected_track = st.session_state.search_results.loc[selected_search_track].to_dict()
                     
                     with st.spinner("Analyzing track..."):
-                        features, analysis = st.session_state.visualizer.get_track_features(selected_track['id'])
+                        features, preview_audio = st.session_state.visualizer.get_track_features(
+                            selected_track['id'], selected_track.get('preview_url')
+                        )
                         if features:
-                            st.session_state.current_track = selected_track
-                            st.session_state.current_features = features
-                            st.session_state.current_analysis = analysis
+                            _set_current_track(selected_track, features, preview_audio)
                             st.success("Track analyzed successfully!")
     
     # Main content area
@@ -572,7 +1056,7 @@ def main():
         if hasattr(st.session_state, 'current_track') and st.session_state.current_track:
             track = st.session_state.current_track
             features = st.session_state.current_features
-            analysis = st.session_state.current_analysis
+            feature_vector = st.session_state.current_feature_vector
             
             # Track info display
             col1, col2, col3 = st.columns([2, 1, 1])
@@ -600,68 +1084,18 @@ def main():
             
             # Audio preview
             if 'preview_url' in track and track['preview_url']:
-                st.audio(track['preview_url'], format='audio/mp3')
-            
-            # Visualization tabs
-            tab1, tab2, tab3, tab4 = st.tabs(["📊 Multi-View", "🌊 Waveform", "🌐 3D Analysis", "📈 Detailed Features"])
-            
-            with tab1:
-                if features and analysis:
-                    fig = create_audio_visualizations(features, analysis, track)
-                    st.plotly_chart(fig, use_container_width=True)
-            
-            with tab2:
-                if analysis:
-                    waveform_fig = create_waveform_visualization(analysis)
-                    if waveform_fig:
-                        st.plotly_chart(waveform_fig, use_container_width=True)
-                    else:
-                        st.info("Waveform data not available for this track")
+                # Prefer the clip downloaded alongside the features so the browser doesn't refetch it
+                st.audio(st.session_state.get('current_preview_audio') or track['preview_url'], format='audio/mp3')
             
-            with tab3:
-                if analysis:
-                    fig_3d = create_3d_visualization(features, analysis)
-                    if fig_3d:
-                        st.plotly_chart(fig_3d, use_container_width=True)
-                    else:
-                        st.info("3D visualization data not available")
+            # The analysis is the slow, heavy request, so fetch it only after the metrics are on screen
+            if not st.session_state.get('analysis_loaded'):
+                with st.spinner("Loading audio analysis..."):
+                    _set_current_analysis(st.session_state.visualizer.get_track_analysis(track['id']))
+            analysis = st.session_state.current_analysis
+            segments = st.session_state.current_segments_soa
             
-            with tab4:
-                if features:
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.subheader("Audio Features")
-                        feature_data = {
-                            'Feature': ['Danceability', 'Energy', 'Speechiness', 'Acousticness', 
-                                      'Instrumentalness', 'Liveness', 'Valence'],
-                            'Value': [features['danceability'], features['energy'], features['speechiness'],
-                                    features['acousticness'], features['instrumentalness'], 
-                                    features['liveness'], features['valence']]
-                        }
-                        df = pd.DataFrame(feature_data)
-                        
-                        fig_bar = px.bar(df, x='Feature', y='Value', 
-                                       color='Value', color_continuous_scale='viridis',
-                                       title="Audio Feature Values")
-                        fig_bar.update_layout(template="plotly_dark", 
-                                            paper_bgcolor='rgba(0,0,0,0)')
-                        st.plotly_chart(fig_bar, use_container_width=True)
-                    
-                    with col2:
-                        st.subheader("Technical Details")
-                        st.write(f"**Key:** {features['key']}")
-                        st.write(f"**Mode:** {'Major' if features['mode'] == 1 else 'Minor'}")
-                        st.write(f"**Time Signature:** {features['time_signature']}/4")
-                        st.write(f"**Tempo:** {features['tempo']:.1f} BPM")
-                        st.write(f"**Duration:** {features['duration_ms'] / 1000:.1f} seconds")
-                        st.write(f"**Loudness:** {features['loudness']:.1f} dB")
-                        
-                        if analysis:
-                            st.subheader("Analysis Summary")
-                            st.write(f"**Sections:** {len(analysis.get('sections', []))}")
-                            st.write(f"**Segments:** {len(analysis.get('segments', []))}")
-                            st.write(f"**Beats:** {len(analysis.get('beats', []))}")
+            # Visualization tabs
+            _render_visualizations(track, features, feature_vector, analysis, segments)
         
         else:
             st.info("👆 Please select a track from the sidebar to start visualizing!")